@@ -1,5 +1,5 @@
 import os
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, render_template, request, jsonify, send_file, Response, stream_with_context
 from flask_cors import CORS
 from dotenv import load_dotenv
 from openai import OpenAI
@@ -8,6 +8,15 @@ import sys
 import importlib.util
 import json
 from datetime import datetime
+from functools import lru_cache
+from llm_cache import cached_chat_completion
+from app_config import REPORT_MAX_AGE, configure_compression
+
+# orjson parses and serializes large payloads several times faster; stdlib json is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Load environment variables
 load_dotenv()
@@ -18,42 +27,105 @@ client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 import openai
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
+# Structured output schema for /api/find-competitors; the model must reply with exactly this shape
+COMPETITOR_LIST_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "competitors": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "url": {"type": "string"}
+                },
+                "required": ["name", "url"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["competitors"],
+    "additionalProperties": False
+}
+
+def parse_json(text):
+    return orjson.loads(text) if orjson else json.loads(text)
+
+def json_response(data, status=200):
+    """jsonify for large payloads, serialized with orjson when available"""
+    if orjson is None:
+        return jsonify(data), status
+    return Response(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS), status=status, mimetype='application/json')
+
 app = Flask(__name__)
 # Enable CORS for all routes with additional settings
 CORS(app, resources={r"/*": {"origins": "*", "allow_headers": ["Content-Type"], "methods": ["GET", "POST", "OPTIONS"]}}, supports_credentials=True)
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = REPORT_MAX_AGE
+configure_compression(app)
 
 # Import the modules from each script
 def import_module_from_file(module_name, file_path):
+    # Reuse a module that has already been executed
+    if module_name in sys.modules:
+        return sys.modules[module_name]
     spec = importlib.util.spec_from_file_location(module_name, file_path)
     module = importlib.util.module_from_spec(spec)
     sys.modules[module_name] = module
-    spec.loader.exec_module(module)
+    try:
+        spec.loader.exec_module(module)
+    except Exception:
+        # Don't leave a half-initialised module behind for the next request
+        del sys.modules[module_name]
+        raise
     return module
 
-# Import scripts
+# Scripts are loaded lazily, on the first request that needs them
 project_dir = os.path.join(os.path.dirname(__file__), "Project")
-competitor_profiler = import_module_from_file(
-    "competitor_profiler", 
-    os.path.join(project_dir, "Competitor and Product Profiler.py")
-)
-news_filter = import_module_from_file(
-    "news_filter", 
-    os.path.join(project_dir, "Filtering News Articles.py")
-)
-website_filter = import_module_from_file(
-    "website_filter", 
-    os.path.join(project_dir, "Website Content Filter.py")
-)
 
-# Import enhanced brand profiler
-enhanced_profiler = import_module_from_file(
-    "enhanced_profiler",
-    os.path.join(os.path.dirname(__file__), "enhanced_brand_profiler.py")
-)
-enhanced_generator = import_module_from_file(
-    "enhanced_generator",
-    os.path.join(os.path.dirname(__file__), "enhanced_report_generator.py")
-)
+@lru_cache(maxsize=None)
+def get_competitor_profiler():
+    return import_module_from_file(
+        "competitor_profiler", 
+        os.path.join(project_dir, "Competitor and Product Profiler.py")
+    )
+
+@lru_cache(maxsize=None)
+def get_news_filter():
+    return import_module_from_file(
+        "news_filter", 
+        os.path.join(project_dir, "Filtering News Articles.py")
+    )
+
+@lru_cache(maxsize=None)
+def get_website_filter():
+    return import_module_from_file(
+        "website_filter", 
+        os.path.join(project_dir, "Website Content Filter.py")
+    )
+
+# Enhanced brand profiler
+@lru_cache(maxsize=None)
+def get_enhanced_profiler():
+    return import_module_from_file(
+        "enhanced_profiler",
+        os.path.join(os.path.dirname(__file__), "enhanced_brand_profiler.py")
+    )
+
+@lru_cache(maxsize=None)
+def get_enhanced_generator():
+    return import_module_from_file(
+        "enhanced_generator",
+        os.path.join(os.path.dirname(__file__), "enhanced_report_generator.py")
+    )
+
+# Shared instances so the profiler's HTTP session keeps its connections warm across requests
+@lru_cache(maxsize=None)
+def get_brand_profiler():
+    return get_enhanced_profiler().EnhancedBrandProfiler()
+
+@lru_cache(maxsize=None)
+def get_report_generator():
+    return get_enhanced_generator().EnhancedReportGenerator()
 
 @app.route('/')
 def index():
@@ -118,7 +190,7 @@ def scrape_competitor():
         return jsonify({"error": "URL is required"}), 400
     
     try:
-        competitor_profiler.scrape_and_analyze(url)
+        get_competitor_profiler().scrape_and_analyze(url)
         return jsonify({"status": "success", "message": "Data saved to company_product_info.csv"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -132,8 +204,7 @@ def find_competitors():
         return jsonify({"error": "URL is required"}), 400
     
     try:
-        # Here we would use OpenAI to analyze the website and find competitors
-        # For now, let's return mock data
+        # Use OpenAI to analyze the website and find competitors
         prompt = f"""
         Analyze the following website URL: {url}
         
@@ -141,54 +212,37 @@ def find_competitors():
         For each competitor, provide:
         1. Company name
         2. Website URL
-        
-        Return the results in JSON format with an array of objects containing 'name' and 'url' properties.
         """
         
-        response = client.chat.completions.create(
+        response = cached_chat_completion(
+            client,
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": "You are an AI that analyzes websites and identifies competitors."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.7,
+            response_format={
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "competitors",
+                    "schema": COMPETITOR_LIST_SCHEMA,
+                    "strict": True
+                }
+            },
+            temperature=0,
             max_tokens=500
         )
         
-        # Parse the response
-        content = response.choices[0].message.content.strip()
-        
-        # Extract JSON from the response (it might be surrounded by markdown code blocks)
-        import re
-        json_match = re.search(r'```json\n([\s\S]*?)\n```', content)
-        if json_match:
-            json_str = json_match.group(1)
-        else:
-            json_str = content
-        
-        # Clean up any remaining markdown or text
-        json_str = re.sub(r'```(json)?', '', json_str).strip()
-        
-        # Parse JSON
-        try:
-            competitors_data = json.loads(json_str)
-            return jsonify(competitors_data)
-        except json.JSONDecodeError:
-            # If JSON parsing fails, return a structured response
-            return jsonify({
-                "competitors": [
-                    {"name": "Competitor A", "url": "https://www.competitora.com"},
-                    {"name": "Competitor B", "url": "https://www.competitorb.com"},
-                    {"name": "Competitor C", "url": "https://www.competitorc.com"}
-                ]
-            })
+        # The schema guarantees a parseable {"competitors": [...]} reply
+        competitors_data = parse_json(response.choices[0].message.content)
+        return json_response(competitors_data)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/filter_news', methods=['GET'])
 def filter_news():
     try:
-        news_filter.main()
+        get_news_filter().main()
         return jsonify({"status": "success", "message": "Filtered articles saved to filtered_articles_extra.xlsx"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -197,10 +251,34 @@ def filter_news():
 def download_file(filename):
     file_path = os.path.join(project_dir, filename)
     if os.path.exists(file_path):
-        return send_file(file_path, as_attachment=True)
+        return send_file(file_path, as_attachment=True, conditional=True, etag=True, max_age=REPORT_MAX_AGE)
     else:
         return jsonify({"error": "File not found"}), 404
 
+# Fixed report instructions, sent first so repeat requests share a cacheable prompt prefix
+REPORT_SYSTEM_PROMPT = """You are an AI that generates detailed competitor intelligence reports.
+
+Generate a comprehensive competitor intelligence report based on the information provided.
+
+The report should include:
+1. Executive summary
+2. Competitive landscape overview
+3. Detailed analysis of each competitor
+4. Strategic recommendations for the main website
+5. Market positioning advice
+
+Format the report in Markdown with proper headings, lists, and sections."""
+
+def stream_report_events(stream):
+    """Relay streamed completion chunks as server-sent events"""
+    try:
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield f"data: {json.dumps({'delta': chunk.choices[0].delta.content})}\n\n"
+        yield "event: done\ndata: {}\n\n"
+    except Exception as e:
+        yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+
 @app.route('/api/generate-report', methods=['POST'])
 def generate_report():
     data = request.json
@@ -211,31 +289,33 @@ def generate_report():
         return jsonify({"error": "Website URL and competitor details are required"}), 400
     
     try:
-        # Use OpenAI to generate a comprehensive report
+        # Use OpenAI to generate a comprehensive report; only the data varies per request
         prompt = f"""
-        Generate a comprehensive competitor intelligence report based on the following information:
-        
         Main website: {website_url}
         
         Competitor information:
         {json.dumps(competitor_details, indent=2)}
+        """
         
-        The report should include:
-        1. Executive summary
-        2. Competitive landscape overview
-        3. Detailed analysis of each competitor
-        4. Strategic recommendations for {website_url}
-        5. Market positioning advice
+        messages = [
+            {"role": "system", "content": REPORT_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
         
-        Format the report in Markdown with proper headings, lists, and sections.
-        """
+        # Clients that accept server-sent events get the report token by token
+        if 'text/event-stream' in request.headers.get('Accept', ''):
+            stream = client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=messages,
+                temperature=0.7,
+                max_tokens=2000,
+                stream=True
+            )
+            return Response(stream_with_context(stream_report_events(stream)), mimetype='text/event-stream')
         
         response = client.chat.completions.create(
             model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are an AI that generates detailed competitor intelligence reports."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=messages,
             temperature=0.7,
             max_tokens=2000
         )
@@ -260,14 +340,14 @@ def enhanced_brand_audit():
     
     try:
         # Analyze brands using enhanced profiler
-        brand_profiles = enhanced_profiler.analyze_competitor_brands(urls)
+        brand_profiles = get_enhanced_profiler().analyze_competitor_brands(urls)
         
         if not brand_profiles:
             return jsonify({"error": "Failed to analyze any brands"}), 500
         
         # Generate enhanced report
         output_filename = f"enhanced_brand_audit_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
-        success = enhanced_generator.generate_report_from_profiles(brand_profiles, output_filename)
+        success = get_enhanced_generator().generate_report_from_profiles(brand_profiles, output_filename)
         
         if success:
             return jsonify({
@@ -293,11 +373,10 @@ def analyze_single_brand():
         return jsonify({"error": "URL is required"}), 400
     
     try:
-        profiler = enhanced_profiler.EnhancedBrandProfiler()
-        brand_profile = profiler.analyze_brand_comprehensive(url)
+        brand_profile = get_brand_profiler().analyze_brand_comprehensive(url)
         
         if brand_profile:
-            return jsonify({
+            return json_response({
                 "status": "success",
                 "brand_profile": brand_profile
             })
@@ -314,10 +393,9 @@ def generate_grid_preview():
     brand_profiles = data.get('brand_profiles', [])
     
     try:
-        generator = enhanced_generator.EnhancedReportGenerator()
-        grid_html = generator.generate_grid_html(brand_profiles)
+        grid_html = get_report_generator().generate_grid_html(brand_profiles)
         
-        return jsonify({
+        return json_response({
             "status": "success",
             "grid_html": grid_html
         })
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Shared Flask App Configuration
+Response settings common to app.py, app_v2.py and the async Railway app
+"""
+
+# Let browsers revalidate repeat report downloads (304 via ETag/Last-Modified)
+REPORT_MAX_AGE = 300
+
+
+def configure_compression(app):
+    """Compress JSON/HTML responses when flask-compress is installed"""
+    # File downloads (direct passthrough) and streamed events are left alone
+    try:
+        from flask_compress import Compress
+    except ImportError:
+        return
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_MIN_SIZE'] = 500
+    app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/html', 'text/css']
+    app.config['COMPRESS_STREAMS'] = False
+    Compress(app)
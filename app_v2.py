@@ -4,17 +4,28 @@ Flask API for Brand Audit V2
 Real data only - no fallbacks or defaults
 """
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_from_directory
+from werkzeug.exceptions import NotFound
 from flask_cors import CORS
 import os
+import re
 import json
 from datetime import datetime
 from enhanced_brand_profiler_v2 import EnhancedBrandProfilerV2
 from competitive_grid_generator_v2 import CompetitiveGridGeneratorV2
 from ai_powered_competitive_intelligence_v2 import AIPoweredCompetitiveIntelligenceV2
+from llm_cache import cache_stats
+from app_config import REPORT_MAX_AGE, configure_compression
 
 app = Flask(__name__)
 CORS(app)
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = REPORT_MAX_AGE
+configure_compression(app)
+
+# Reports are written relative to the working directory; only names the
+# generators produce may be downloaded from it
+REPORT_DIR = os.path.abspath(os.getcwd())
+REPORT_FILENAME_PATTERN = re.compile(r'^(grid|intelligence)_v2_\d{8}_\d{6}\.html$')
 
 # Initialize V2 components
 brand_profiler = EnhancedBrandProfilerV2()
@@ -64,7 +75,8 @@ def health_check():
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "version": "2.0.0",
-        "openai_configured": bool(os.getenv("OPENAI_API_KEY"))
+        "openai_configured": bool(os.getenv("OPENAI_API_KEY")),
+        "llm_cache": cache_stats()
     })
 
 @app.route('/api/v2/analyze-brand', methods=['POST'])
@@ -224,19 +236,15 @@ def generate_ai_intelligence():
 def download_report(filename):
     """Download generated report"""
     try:
-        # Security check - only allow specific file patterns
-        if not (filename.startswith('grid_v2_') or filename.startswith('intelligence_v2_')):
+        # Security check - only allow generated report names (no paths)
+        if not REPORT_FILENAME_PATTERN.match(filename):
             return jsonify({"error": "Invalid filename"}), 400
         
-        if not filename.endswith('.html'):
-            return jsonify({"error": "Invalid file type"}), 400
-        
-        # Check if file exists
-        if os.path.exists(filename):
-            return send_file(filename, as_attachment=True)
-        else:
-            return jsonify({"error": "File not found"}), 404
+        return send_from_directory(REPORT_DIR, filename, as_attachment=True, mimetype='text/html',
+                                   conditional=True, etag=True, max_age=REPORT_MAX_AGE)
             
+    except NotFound:
+        return jsonify({"error": "File not found"}), 404
     except Exception as e:
         return jsonify({"error": f"Download failed: {str(e)}"}), 500
 
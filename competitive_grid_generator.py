@@ -5,22 +5,27 @@ Generates exactly the 5-row brand comparison grid as specified in the user requi
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+from jinja2 import Environment, FileSystemLoader
 import openai
 from openai import OpenAI
 import pandas as pd
 import os
 import json
 import re
+import hashlib
 from PIL import Image
 import io
 import base64
 from urllib.parse import urljoin, urlparse
 import numpy as np
-from sklearn.cluster import KMeans
+from sklearn.cluster import KMeans, MiniBatchKMeans
 import colorsys
 from datetime import datetime
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
@@ -28,27 +33,109 @@ from selenium.webdriver.common.by import By
 # Initialize OpenAI client
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# Upper bound on brands analyzed concurrently
+MAX_ANALYSIS_WORKERS = 8
+
+# Pages are read up to this size; everything the extractors use sits in the
+# head and top of the body, while multi-MB retail pages are mostly trailing
+# markup. Kept well above 64 KB because inline head scripts alone often exceed it
+MAX_PAGE_BYTES = 512 * 1024
+
+# Logo candidates kept per page; selector scanning stops once this many are found
+MAX_LOGO_CANDIDATES = 3
+
+# Keep-alive pool shared by page and stylesheet fetches from every worker
+HTTP_POOL_SIZE = 32
+
+# BeautifulSoup backend: lxml's C parser when installed, stdlib parser otherwise
+try:
+    import lxml
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Hex and rgb() color tokens in CSS, the channel values inside rgb(), and
+# markdown code fences the model sometimes wraps its JSON in. Hex tokens
+# must stand alone, so HTML entities (&#039;), in-page links (href="#fab")
+# and URL fragments (/page#cafe) are not read as colors
+_COLOR_RE = re.compile(
+    r'(?<![&\w/])(?<!href=")(?<!href=\')'
+    r'#(?:[0-9a-fA-F]{6}|[0-9a-fA-F]{3})(?![\w-])'
+    r'|rgb\([^)]+\)'
+)
+_RGB_TRIPLE_RE = re.compile(r'rgb\(\s*(\d{1,3})[^\d)]+(\d{1,3})[^\d)]+(\d{1,3})')
+_JSON_FENCE_RE = re.compile(r"```(json)?")
+
+# The grid page is a Jinja template under templates/, compiled once per process
+GRID_TEMPLATE = 'competitive_grid.html'
+_TEMPLATE_ENV = Environment(
+    loader=FileSystemLoader(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')),
+    autoescape=True
+)
+
+# Parsed AI brand-info answers are kept on disk so re-runs over the same pages
+# skip the API; entries older than the TTL are refetched
+BRAND_CACHE_DIR = os.getenv("BRAND_CACHE_DIR", ".brand_cache")
+BRAND_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+
+def _brand_cache_path(request):
+    """Cache file for a chat request, named by the SHA-256 of its parameters"""
+    payload = json.dumps(request, sort_keys=True)
+    return os.path.join(BRAND_CACHE_DIR, hashlib.sha256(payload.encode('utf-8')).hexdigest() + '.json')
+
+
+def _load_cached_brand_info(path):
+    """Cached brand info for path, or None if missing, expired or unreadable"""
+    try:
+        if time.time() - os.path.getmtime(path) > BRAND_CACHE_TTL_SECONDS:
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _store_cached_brand_info(path, brand_info):
+    """Write brand info atomically so concurrent workers never read a partial file"""
+    try:
+        os.makedirs(BRAND_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(brand_info, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Could not cache brand info: {e}")
+
 class CompetitiveGridGenerator:
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         self.driver = None
     
     def fetch_page(self, url):
-        """Fetch webpage content with error handling"""
+        """Fetch webpage content with error handling, reading at most MAX_PAGE_BYTES"""
         try:
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            return response.text
+            response = self.session.get(url, timeout=15, stream=True)
+            try:
+                response.raise_for_status()
+                body = response.raw.read(MAX_PAGE_BYTES, decode_content=True)
+            finally:
+                response.close()
+            return body.decode(response.encoding or 'utf-8', errors='replace')
         except Exception as e:
             print(f"Failed to retrieve the page: {url} -- {e}")
             return None
     
-    def extract_logos(self, html_content, base_url):
-        """Extract logo URLs from webpage"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+    def extract_logos(self, html_content, base_url, soup=None):
+        """Extract logo URLs from webpage (pass soup to reuse an existing parse)"""
+        if soup is None:
+            soup = BeautifulSoup(html_content, HTML_PARSER)
         logo_urls = []
         
         # Common logo selectors
@@ -62,94 +149,78 @@ class CompetitiveGridGenerator:
             'header img'
         ]
         
+        # Candidates keep discovery order; stop as soon as enough are found
         for selector in logo_selectors:
-            logos = soup.select(selector)
-            for logo in logos:
+            for logo in soup.select(selector):
                 src = logo.get('src')
-                if src:
-                    full_url = urljoin(base_url, src)
-                    if self._is_likely_logo(src, logo.get('alt', '')):
-                        logo_urls.append(full_url)
+                if not src or not self._is_likely_logo(src, logo.get('alt', '')):
+                    continue
+                full_url = urljoin(base_url, src)
+                if full_url not in logo_urls:
+                    logo_urls.append(full_url)
+                    if len(logo_urls) >= MAX_LOGO_CANDIDATES:
+                        return logo_urls
         
-        return list(set(logo_urls))[:3]  # Return top 3 logo candidates
+        return logo_urls
     
     def _is_likely_logo(self, src, alt_text):
         """Determine if an image is likely a logo"""
-        logo_indicators = ['logo', 'brand', 'header']
         src_lower = src.lower()
         alt_lower = alt_text.lower()
         
-        # Check for logo indicators in src or alt text
-        for indicator in logo_indicators:
-            if indicator in src_lower or indicator in alt_lower:
-                return True
-        
-        # Avoid common non-logo patterns
+        # Avoid common non-logo patterns, even when a logo word also appears
         avoid_patterns = ['banner', 'hero', 'background', 'icon', 'social']
-        for pattern in avoid_patterns:
-            if pattern in src_lower:
-                return False
-                
-        return False
+        if any(pattern in src_lower for pattern in avoid_patterns):
+            return False
+        
+        # Check for logo indicators in src or alt text
+        logo_indicators = ['logo', 'brand', 'header']
+        return any(indicator in src_lower or indicator in alt_lower for indicator in logo_indicators)
     
     def extract_colors_from_html(self, html_content):
         """Extract dominant colors from webpage HTML/CSS"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        colors = []
-        
-        # Extract colors from CSS styles
-        styles = soup.find_all('style')
-        for style in styles:
-            css_content = style.get_text()
-            color_matches = re.findall(r'#[0-9a-fA-F]{6}|#[0-9a-fA-F]{3}|rgb\([^)]+\)', css_content)
-            colors.extend(color_matches)
-        
-        # Extract colors from inline styles
-        for element in soup.find_all(style=True):
-            style_content = element.get('style', '')
-            color_matches = re.findall(r'#[0-9a-fA-F]{6}|#[0-9a-fA-F]{3}|rgb\([^)]+\)', style_content)
-            colors.extend(color_matches)
+        # One scan of the raw page covers <style> blocks, inline style
+        # attributes and SVG fill/stroke attributes without walking the DOM
+        colors = _COLOR_RE.findall(html_content)
         
         return self._process_colors(colors)
     
     def _process_colors(self, color_list):
         """Process and cluster colors to get dominant palette"""
-        processed_colors = []
-        
-        for color in color_list:
-            try:
-                if color.startswith('#'):
-                    # Convert hex to RGB
-                    if len(color) == 4:  # #abc format
-                        color = '#' + ''.join([c*2 for c in color[1:]])
-                    rgb = tuple(int(color[i:i+2], 16) for i in (1, 3, 5))
-                elif color.startswith('rgb'):
-                    # Extract RGB values
-                    rgb_values = re.findall(r'\d+', color)
-                    rgb = tuple(int(val) for val in rgb_values[:3])
-                else:
-                    continue
-                
-                # Filter out very light/dark colors and ensure valid RGB
-                if all(0 <= val <= 255 for val in rgb) and not (all(val > 240 for val in rgb) or all(val < 15 for val in rgb)):
-                    processed_colors.append(rgb)
-            except:
-                continue
-        
-        if not processed_colors:
+        # Hex tokens become one byte string (#abc shorthand doubled to #aabbcc)
+        # decoded in a single call; rgb() triples come from one regex pass
+        hex_digits = ''.join(color[1:] if len(color) == 7 else ''.join(c * 2 for c in color[1:])
+                             for color in color_list if color.startswith('#'))
+        rgb_triples = _RGB_TRIPLE_RE.findall(' '.join(color for color in color_list if color.startswith('rgb')))
+        
+        colors_array = np.concatenate((
+            np.frombuffer(bytes.fromhex(hex_digits), dtype=np.uint8).reshape(-1, 3).astype(np.int16),
+            np.array(rgb_triples, dtype=np.int16).reshape(-1, 3)
+        ))
+        
+        # Filter out very light/dark colors and ensure valid RGB
+        keep = ((colors_array <= 255).all(axis=1)
+                & ~(colors_array > 240).all(axis=1)
+                & ~(colors_array < 15).all(axis=1))
+        processed_colors = colors_array[keep]
+        
+        if not len(processed_colors):
             return ['#666666', '#999999', '#cccccc', '#e9ecef', '#f8f9fa', '#ffffff']  # Default colors
         
         # Use K-means clustering to find dominant colors
         try:
-            colors_array = np.array(processed_colors)
-            n_colors = min(6, len(set(map(tuple, processed_colors))))
+            # Pages repeat the same few colors many times; cluster each distinct
+            # color once, weighted by how often it occurs
+            unique_colors, counts = np.unique(processed_colors.astype(np.uint8),
+                                              axis=0, return_counts=True)
+            n_colors = min(6, len(unique_colors))
             
             if n_colors > 1:
-                kmeans = KMeans(n_clusters=n_colors, random_state=42, n_init=10)
-                kmeans.fit(colors_array)
+                kmeans = KMeans(n_clusters=n_colors, random_state=42, n_init=4)
+                kmeans.fit(unique_colors, sample_weight=counts)
                 dominant_colors = kmeans.cluster_centers_.astype(int)
             else:
-                dominant_colors = colors_array[:6]
+                dominant_colors = unique_colors[:6]
             
             # Convert back to hex
             hex_colors = []
@@ -161,14 +232,15 @@ class CompetitiveGridGenerator:
         except:
             return ['#666666', '#999999', '#cccccc', '#e9ecef', '#f8f9fa', '#ffffff']
     
-    def extract_brand_info(self, html_content, url):
+    def extract_brand_info(self, html_content, url, soup=None):
         """Extract comprehensive brand information using AI"""
         
         # Use more content for better analysis
         truncated_html = html_content[:25000]
         
         # Extract specific sections for better analysis
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if soup is None:
+            soup = BeautifulSoup(html_content, HTML_PARSER)
         
         # Get hero section
         hero_text = ""
@@ -216,19 +288,21 @@ class CompetitiveGridGenerator:
             """}
         ]
         
+        request = {"model": "gpt-4o-mini", "messages": messages, "temperature": 0.3, "max_tokens": 1000}
+        cache_path = _brand_cache_path(request)
+        cached = _load_cached_brand_info(cache_path)
+        if cached is not None:
+            return cached
+        
         try:
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=messages,
-                temperature=0.3,
-                max_tokens=1000
-            )
+            response = client.chat.completions.create(**request)
             
             content = response.choices[0].message.content.strip()
             # Clean JSON response
-            content = re.sub(r"```(json)?", "", content).strip()
+            content = _JSON_FENCE_RE.sub("", content).strip()
             parsed_response = json.loads(content)
             
+            _store_cached_brand_info(cache_path, parsed_response)
             return parsed_response
         except Exception as e:
             print(f"Error extracting brand info: {e}")
@@ -281,20 +355,17 @@ class CompetitiveGridGenerator:
             # Convert to RGB and get dominant colors
             img_rgb = img.convert('RGB')
             img_array = np.array(img_rgb)
-            pixels = img_array.reshape(-1, 3)
+            pixels = img_array.reshape(-1, 3).astype(np.int16)
             
             # Filter out common web colors (white, black, grays)
-            filtered_pixels = []
-            for pixel in pixels:
-                r, g, b = pixel
-                # Skip very light, very dark, or very gray colors
-                if not (all(c > 240 for c in [r,g,b]) or all(c < 15 for c in [r,g,b]) or 
-                       (max(r,g,b) - min(r,g,b) < 30)):
-                    filtered_pixels.append(pixel)
+            # Skip very light, very dark, or very gray colors
+            keep = ~((pixels > 240).all(axis=1) | (pixels < 15).all(axis=1) |
+                     (pixels.max(axis=1) - pixels.min(axis=1) < 30))
+            filtered_pixels = pixels[keep]
             
             if len(filtered_pixels) > 100:
-                # Use K-means to find dominant colors
-                kmeans = KMeans(n_clusters=6, random_state=42, n_init=10)
+                # Mini-batch K-means is plenty for picking 6 swatches from pixels
+                kmeans = MiniBatchKMeans(n_clusters=6, random_state=42, n_init=3, batch_size=1024)
                 kmeans.fit(filtered_pixels[:5000])  # Sample for performance
                 
                 hex_colors = []
@@ -311,9 +382,10 @@ class CompetitiveGridGenerator:
         # Fallback to CSS-based extraction
         return self.extract_colors_from_html(html_content)
     
-    def extract_logos_deep(self, html_content, base_url):
+    def extract_logos_deep(self, html_content, base_url, soup=None):
         """Deep logo extraction with multiple approaches"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if soup is None:
+            soup = BeautifulSoup(html_content, HTML_PARSER)
         logo_urls = []
         
         print("     🔍 Searching header logos...")
@@ -334,35 +406,28 @@ class CompetitiveGridGenerator:
         ]
         
         for selector in logo_selectors:
-            elements = soup.select(selector)
-            for img in elements:
+            for img in soup.select(selector):
                 src = img.get('src') or img.get('data-src')
                 if src and self._is_likely_logo(src, img.get('alt', '')):
                     full_url = urljoin(base_url, src)
                     if full_url not in logo_urls:
                         logo_urls.append(full_url)
                         print(f"     ✓ Found logo: {src}")
+                        if len(logo_urls) >= MAX_LOGO_CANDIDATES:
+                            print(f"     📊 Total logos found: {len(logo_urls)}")
+                            return logo_urls
         
         print(f"     📊 Total logos found: {len(logo_urls)}")
-        return logo_urls[:3]  # Return top 3
+        return logo_urls
     
-    def extract_colors_deep(self, html_content, url):
+    def extract_colors_deep(self, html_content, url, soup=None):
         """Deep color extraction with multiple methods"""
         print("     🎨 Analyzing CSS files...")
-        soup = BeautifulSoup(html_content, 'html.parser')
-        all_colors = set()
-        
-        # Extract from inline styles
-        for element in soup.find_all(style=True):
-            style = element.get('style', '')
-            colors = re.findall(r'#[0-9a-fA-F]{6}|#[0-9a-fA-F]{3}|rgb\([^)]+\)', style)
-            all_colors.update(colors)
+        if soup is None:
+            soup = BeautifulSoup(html_content, HTML_PARSER)
         
-        # Extract from style tags
-        for style_tag in soup.find_all('style'):
-            css_content = style_tag.get_text()
-            colors = re.findall(r'#[0-9a-fA-F]{6}|#[0-9a-fA-F]{3}|rgb\([^)]+\)', css_content)
-            all_colors.update(colors)
+        # Inline styles and style tags, in one scan of the raw page
+        all_colors = set(_COLOR_RE.findall(html_content))
         
         # Extract from linked CSS files
         for link in soup.find_all('link', rel='stylesheet'):
@@ -372,7 +437,7 @@ class CompetitiveGridGenerator:
                 try:
                     css_response = self.session.get(css_url, timeout=10)
                     if css_response.status_code == 200:
-                        css_colors = re.findall(r'#[0-9a-fA-F]{6}|#[0-9a-fA-F]{3}|rgb\([^)]+\)', css_response.text)
+                        css_colors = _COLOR_RE.findall(css_response.text)
                         all_colors.update(css_colors)
                         print(f"     ✓ Analyzed CSS file: {href}")
                 except:
@@ -515,17 +580,20 @@ class CompetitiveGridGenerator:
             """}
         ]
         
+        # Lower temperature for more consistent results
+        request = {"model": "gpt-4o-mini", "messages": messages, "temperature": 0.1, "max_tokens": 1200}
+        cache_path = _brand_cache_path(request)
+        cached = _load_cached_brand_info(cache_path)
+        if cached is not None:
+            print("     ♻️ Using cached AI analysis")
+            return cached
+        
         try:
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=messages,
-                temperature=0.1,  # Lower temperature for more consistent results
-                max_tokens=1200
-            )
+            response = client.chat.completions.create(**request)
             
             content = response.choices[0].message.content.strip()
             # Clean up response
-            content = re.sub(r"```(json)?", "", content).strip()
+            content = _JSON_FENCE_RE.sub("", content).strip()
             content = content.replace("```", "").strip()
             
             # Try to find JSON in response
@@ -537,18 +605,19 @@ class CompetitiveGridGenerator:
             else:
                 raise ValueError("No JSON found in response")
             
+            _store_cached_brand_info(cache_path, parsed_response)
             return parsed_response
         except Exception as e:
             print(f"     ❌ AI analysis failed: {e}")
             return self._get_default_brand_info()
     
-    def extract_logos_comprehensive(self, html_content, base_url):
+    def extract_logos_comprehensive(self, html_content, base_url, soup=None):
         """Comprehensive logo extraction with multiple methods"""
-        return self.extract_logos_deep(html_content, base_url)
+        return self.extract_logos_deep(html_content, base_url, soup)
     
-    def extract_colors_comprehensive(self, html_content, url):
+    def extract_colors_comprehensive(self, html_content, url, soup=None):
         """Comprehensive color extraction"""
-        return self.extract_colors_deep(html_content, url)
+        return self.extract_colors_deep(html_content, url, soup)
     
     def _analyze_visual_elements(self, soup):
         """Analyze visual design elements"""
@@ -583,31 +652,40 @@ class CompetitiveGridGenerator:
             return None
         
         print("   📊 Analyzing page structure...")
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # Parsed once and shared by every extractor below
+        soup = BeautifulSoup(html_content, HTML_PARSER)
         
         # Extract multiple content sections for comprehensive analysis
         print("   📝 Extracting content sections...")
         content_sections = self._extract_content_sections(soup)
         
-        print("   🧠 Deep AI brand analysis...")
-        # Extract brand information with comprehensive content
-        brand_info = self.extract_brand_info_comprehensive(html_content, url, content_sections)
-        
-        print("   🖼️ Comprehensive logo search...")
-        # Extract logos with multiple methods
-        logos = self.extract_logos_comprehensive(html_content, url)
-        
-        print("   🎨 Advanced color analysis...")
-        # Extract colors from multiple sources
-        colors = self.extract_colors_comprehensive(html_content, url)
-        
-        print("   📸 Capturing homepage screenshot...")
-        # Capture screenshot
-        screenshot = self.capture_screenshot_proper(url)
-        
-        print("   🔬 Analyzing visual elements...")
-        # Extract additional visual information
-        visual_elements = self._analyze_visual_elements(soup)
+        # The AI call and the browser screenshot are the slowest steps and need
+        # nothing from each other, so they run alongside the soup-based extraction
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            print("   🧠 Deep AI brand analysis...")
+            # Extract brand information with comprehensive content
+            brand_info_future = executor.submit(
+                self.extract_brand_info_comprehensive, html_content, url, content_sections
+            )
+            
+            print("   📸 Capturing homepage screenshot...")
+            # Capture screenshot
+            screenshot_future = executor.submit(self.capture_screenshot_proper, url)
+            
+            print("   🖼️ Comprehensive logo search...")
+            # Extract logos with multiple methods
+            logos = self.extract_logos_comprehensive(html_content, url, soup)
+            
+            print("   🎨 Advanced color analysis...")
+            # Extract colors from multiple sources
+            colors = self.extract_colors_comprehensive(html_content, url, soup)
+            
+            print("   🔬 Analyzing visual elements...")
+            # Extract additional visual information
+            visual_elements = self._analyze_visual_elements(soup)
+            
+            brand_info = brand_info_future.result()
+            screenshot = screenshot_future.result()
         
         print("   ✅ Compiling comprehensive brand profile...")
         
@@ -637,6 +715,14 @@ class CompetitiveGridGenerator:
         
         return brand_profile
     
+    def _analyze_brand_safely(self, url):
+        """analyze_brand for worker threads; logs errors and returns None instead of raising"""
+        try:
+            return self.analyze_brand(url)
+        except Exception as e:
+            print(f"✗ Error analyzing {url}: {e}")
+            return None
+    
     def cleanup(self):
         """Clean up resources"""
         if self.driver:
@@ -646,385 +732,10 @@ class CompetitiveGridGenerator:
     def generate_grid_html(self, brand_profiles, page_title="There is a huge opportunity in the category"):
         """Generate the exact 5-row competitive landscape grid as HTML"""
         
-        # Use actual number of brands analyzed (no padding or truncating)
-        num_brands = len(brand_profiles)
-        
-        html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Competitive Landscape Analysis - {datetime.now().strftime('%B %d, %Y')}</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.4;
-            color: #333;
-            background: #f8f9fa;
-        }}
-        
-        .page {{
-            width: 100vw;
-            min-height: 100vh;
-            background: white;
-            margin: 0;
-            padding: 20px;
-        }}
-        
-        .page-header {{
-            text-align: center;
-            margin-bottom: 30px;
-            position: relative;
-        }}
-        
-        .page-number {{
-            position: absolute;
-            top: 0;
-            right: 0;
-            font-size: 0.9em;
-            color: #6c757d;
-            background: white;
-            padding: 5px 10px;
-            border-radius: 3px;
-            border: 1px solid #e9ecef;
-        }}
-        
-        .main-title {{
-            font-size: 2.5em;
-            font-weight: 700;
-            color: #2c3e50;
-            margin-bottom: 10px;
-            line-height: 1.2;
-        }}
-        
-        .subtitle {{
-            font-size: 1.1em;
-            color: #6c757d;
-            margin-bottom: 5px;
-        }}
-        
-        .analysis-date {{
-            font-size: 0.9em;
-            color: #8e9ba8;
-        }}
-        
-        /* ===== 5-ROW BRAND GRID SYSTEM ===== */
-        .brand-grid-container {{
-            background: white;
-            border-radius: 10px;
-            padding: 20px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-            overflow: hidden;
-            max-width: 100%;
-        }}
-        
-        .brand-grid {{
-            display: grid;
-            grid-template-columns: repeat({num_brands}, 1fr);
-            grid-template-rows: 70px 140px 90px 70px 180px;
-            gap: 12px;
-            min-height: 550px;
-        }}
-        
-        /* Row 1: Company Logos */
-        .logo-cell {{
-            grid-row: 1;
-            background: white;
-            border: 1px solid #e9ecef;
-            border-radius: 8px;
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            justify-content: center;
-            padding: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-        }}
-        
-        .brand-logo-img {{
-            max-width: 100%;
-            max-height: 35px;
-            object-fit: contain;
-            margin-bottom: 5px;
-        }}
-        
-        .brand-logo-placeholder {{
-            width: 100%;
-            height: 35px;
-            background: linear-gradient(135deg, #e9ecef, #dee2e6);
-            border-radius: 4px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-size: 0.7em;
-            color: #6c757d;
-            font-weight: 600;
-            margin-bottom: 5px;
-            text-align: center;
-            line-height: 1.1;
-        }}
-        
-        .brand-name {{
-            font-size: 0.65em;
-            font-weight: 600;
-            color: #495057;
-            text-align: center;
-            line-height: 1.1;
-        }}
-        
-        /* Row 2: Brand Positioning Statements */
-        .positioning-cell {{
-            grid-row: 2;
-            background: white;
-            border: 1px solid #e9ecef;
-            border-radius: 8px;
-            padding: 12px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-            overflow: hidden;
-        }}
-        
-        .positioning-text {{
-            font-size: 0.75em;
-            line-height: 1.3;
-            color: #495057;
-            text-align: left;
-            overflow: hidden;
-            display: -webkit-box;
-            -webkit-line-clamp: 8;
-            -webkit-box-orient: vertical;
-        }}
-        
-        /* Row 3: Brand Personality Descriptors */
-        .personality-cell {{
-            grid-row: 3;
-            background: white;
-            border: 1px solid #e9ecef;
-            border-radius: 8px;
-            padding: 10px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-            display: flex;
-            flex-direction: column;
-            justify-content: flex-start;
-        }}
-        
-        .personality-words {{
-            display: flex;
-            flex-wrap: wrap;
-            gap: 4px;
-        }}
-        
-        .personality-tag {{
-            background: #f8f9fa;
-            border: 1px solid #e9ecef;
-            border-radius: 12px;
-            padding: 3px 8px;
-            font-size: 0.65em;
-            font-weight: 500;
-            color: #495057;
-            white-space: nowrap;
-        }}
-        
-        /* Row 4: Color Palette Swatches */
-        .color-cell {{
-            grid-row: 4;
-            background: white;
-            border: 1px solid #e9ecef;
-            border-radius: 8px;
-            padding: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-            display: flex;
-            flex-direction: column;
-        }}
-        
-        .color-swatches {{
-            display: grid;
-            grid-template-columns: repeat(6, 1fr);
-            gap: 3px;
-            flex-grow: 1;
-        }}
-        
-        .color-swatch {{
-            height: 25px;
-            border-radius: 3px;
-            border: 1px solid #dee2e6;
-            position: relative;
-            cursor: pointer;
-        }}
-        
-        .color-labels {{
-            font-size: 0.6em;
-            color: #6c757d;
-            text-align: center;
-            margin-top: 4px;
-            line-height: 1.1;
-        }}
-        
-        /* Row 5: Visual Assets & Screenshots */
-        .visual-cell {{
-            grid-row: 5;
-            background: white;
-            border: 1px solid #e9ecef;
-            border-radius: 8px;
-            padding: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-            display: flex;
-            flex-direction: column;
-        }}
-        
-        .screenshot-container {{
-            flex-grow: 1;
-            background: #f8f9fa;
-            border-radius: 4px;
-            border: 1px solid #e9ecef;
-            overflow: hidden;
-            position: relative;
-            margin-bottom: 6px;
-        }}
-        
-        .screenshot-placeholder {{
-            width: 100%;
-            height: 100%;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-size: 0.7em;
-            color: #6c757d;
-            text-align: center;
-            line-height: 1.2;
-        }}
-        
-        .visual-assets-list {{
-            font-size: 0.6em;
-            color: #6c757d;
-            line-height: 1.2;
-        }}
-        
-        /* Grid positioning for each brand column */
-        .brand-col-1 {{ grid-column: 1; }}
-        .brand-col-2 {{ grid-column: 2; }}
-        .brand-col-3 {{ grid-column: 3; }}
-        .brand-col-4 {{ grid-column: 4; }}
-        .brand-col-5 {{ grid-column: 5; }}
-        .brand-col-6 {{ grid-column: 6; }}
-        .brand-col-7 {{ grid-column: 7; }}
-        .brand-col-8 {{ grid-column: 8; }}
-        .brand-col-9 {{ grid-column: 9; }}
-        .brand-col-10 {{ grid-column: 10; }}
-        
-        /* Responsive Design */
-        @media (max-width: 1200px) {{
-            .brand-grid {{
-                grid-template-columns: repeat(5, 1fr);
-            }}
-            
-            .brand-col-1, .brand-col-6 {{ grid-column: 1; }}
-            .brand-col-2, .brand-col-7 {{ grid-column: 2; }}
-            .brand-col-3, .brand-col-8 {{ grid-column: 3; }}
-            .brand-col-4, .brand-col-9 {{ grid-column: 4; }}
-            .brand-col-5, .brand-col-10 {{ grid-column: 5; }}
-        }}
-        
-        @media print {{
-            .page {{
-                page-break-after: always;
-                width: 210mm;
-                min-height: 297mm;
-            }}
-            
-            body {{
-                print-color-adjust: exact;
-                -webkit-print-color-adjust: exact;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="page">
-        <div class="page-header">
-            <div class="page-number">Page 1</div>
-            <h1 class="main-title">{page_title}</h1>
-            <p class="subtitle">Competitive Landscape Analysis</p>
-            <p class="analysis-date">Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}</p>
-        </div>
-        
-        <div class="brand-grid-container">
-            <div class="brand-grid">"""
-
-        # Generate grid cells for each brand
-        for i, brand in enumerate(brand_profiles, 1):
-            col_class = f"brand-col-{i}"
-            
-            # Row 1: Company Logos
-            logo_html = f'<img src="{brand["logo_url"]}" alt="{brand["company_name"]} logo" class="brand-logo-img">' if brand.get("logo_url") else f'<div class="brand-logo-placeholder">{brand["company_name"].upper()}</div>'
-            
-            html_content += f"""
-                <!-- Brand {i}: {brand["company_name"]} -->
-                <!-- Row 1: Logo -->
-                <div class="logo-cell {col_class}">
-                    {logo_html}
-                    <div class="brand-name">{brand["company_name"]}</div>
-                </div>
-                
-                <!-- Row 2: Positioning -->
-                <div class="positioning-cell {col_class}">
-                    <div class="positioning-text">{brand["brand_positioning"]}</div>
-                </div>
-                
-                <!-- Row 3: Personality -->
-                <div class="personality-cell {col_class}">
-                    <div class="personality-words">"""
-            
-            # Add personality tags
-            for descriptor in brand["personality_descriptors"]:
-                html_content += f'<span class="personality-tag">{descriptor}</span>'
-            
-            html_content += f"""
-                    </div>
-                </div>
-                
-                <!-- Row 4: Colors -->
-                <div class="color-cell {col_class}">
-                    <div class="color-swatches">"""
-            
-            # Add color swatches
-            for color in brand["color_palette"]:
-                html_content += f'<div class="color-swatch" style="background-color: {color};"></div>'
-            
-            # Add primary colors in labels
-            primary_colors = " • ".join(brand["color_palette"][:3])
-            html_content += f"""
-                    </div>
-                    <div class="color-labels">{primary_colors}</div>
-                </div>
-                
-                <!-- Row 5: Visual Assets -->
-                <div class="visual-cell {col_class}">
-                    <div class="screenshot-container">"""
-            
-            # Add actual screenshot or placeholder
-            if brand.get("screenshot"):
-                html_content += f'<img src="{brand["screenshot"]}" alt="Homepage Screenshot" style="width:100%; height:100%; object-fit:cover; border-radius:4px;">'
-            else:
-                html_content += '<div class="screenshot-placeholder">Homepage Screenshot</div>'
-            
-            html_content += f"""
-                    </div>
-                    <div class="visual-assets-list">{brand["visual_style"]} • Brand materials</div>
-                </div>"""
-        
-        html_content += """
-            </div>
-        </div>
-    </div>
-</body>
-</html>"""
-        
-        return html_content
+        # Columns follow the actual number of brands analyzed (no padding or
+        # truncating); autoescaping keeps scraped and AI-written text inert
+        template = _TEMPLATE_ENV.get_template(GRID_TEMPLATE)
+        return template.render(brand_profiles=brand_profiles, page_title=page_title, now=datetime.now())
     
     def generate_competitive_landscape_report(self, urls, page_title="There is a huge opportunity in the category", output_filename=None):
         """Generate complete competitive landscape report"""
@@ -1040,22 +751,27 @@ class CompetitiveGridGenerator:
         seen_companies = set()
         
         try:
-            for url in urls:
-                try:
-                    profile = self.analyze_brand(url)
-                    if profile:
-                        company_name = profile['company_name']
-                        # Deduplicate by company name
-                        if company_name not in seen_companies:
-                            brand_profiles.append(profile)
-                            seen_companies.add(company_name)
-                            print(f"✓ Analyzed: {company_name}")
-                        else:
-                            print(f"⚠ Skipped duplicate: {company_name}")
+            # Fetching, AI calls and screenshots are I/O bound, so brands are
+            # analyzed concurrently; map() keeps results in input order so the
+            # grid columns and duplicate handling stay stable
+            if urls:
+                with ThreadPoolExecutor(max_workers=min(MAX_ANALYSIS_WORKERS, len(urls))) as executor:
+                    results = list(executor.map(self._analyze_brand_safely, urls))
+            else:
+                results = []
+            
+            for url, profile in zip(urls, results):
+                if profile:
+                    company_name = profile['company_name']
+                    # Deduplicate by company name
+                    if company_name not in seen_companies:
+                        brand_profiles.append(profile)
+                        seen_companies.add(company_name)
+                        print(f"✓ Analyzed: {company_name}")
                     else:
-                        print(f"✗ Failed to analyze: {url}")
-                except Exception as e:
-                    print(f"✗ Error analyzing {url}: {e}")
+                        print(f"⚠ Skipped duplicate: {company_name}")
+                else:
+                    print(f"✗ Failed to analyze: {url}")
         finally:
             # Always cleanup driver
             self.cleanup()
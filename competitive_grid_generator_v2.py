@@ -13,6 +13,7 @@ import json
 import re
 from datetime import datetime
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from enhanced_brand_profiler_v2 import EnhancedBrandProfilerV2
@@ -30,6 +31,9 @@ except ImportError:
     client = None
     OPENAI_VERSION = "old"
 
+# Upper bound on brands analyzed concurrently
+MAX_ANALYSIS_WORKERS = 8
+
 class CompetitiveGridGeneratorV2:
     def __init__(self):
         self.profiler = EnhancedBrandProfilerV2()
@@ -65,35 +69,33 @@ class CompetitiveGridGeneratorV2:
             print(f"OpenAI API error: {e}")
             return None
     
-    def analyze_brands(self, urls):
-        """Analyze multiple brands - real data only"""
+    def analyze_brands(self, urls, progress_callback=None):
+        """Analyze multiple brands - real data only
+        
+        progress_callback, if given, is called as progress_callback(completed, total, url)
+        each time a brand finishes (in completion order, from the calling thread).
+        """
         print(f"🔍 ANALYZING {len(urls)} BRANDS - REAL DATA ONLY")
         print(f"{'='*60}")
         
-        for i, url in enumerate(urls, 1):
-            print(f"\n[{i}/{len(urls)}] Analyzing: {url}")
+        # Scraping and AI calls are I/O bound, so brands are analyzed concurrently.
+        # Results are reassembled in input order to keep the grid columns stable.
+        if urls:
+            total = len(urls)
+            results = [None] * total
+            with ThreadPoolExecutor(max_workers=min(MAX_ANALYSIS_WORKERS, total)) as executor:
+                futures = {
+                    executor.submit(self._analyze_single_brand, url, i, total): i - 1
+                    for i, url in enumerate(urls, 1)
+                }
+                for completed, future in enumerate(as_completed(futures), 1):
+                    index = futures[future]
+                    results[index] = future.result()
+                    if progress_callback:
+                        progress_callback(completed, total, urls[index])
             
-            try:
-                profile = self.profiler.analyze_brand(url)
-                
-                if profile['status'] == 'success':
-                    # Additional AI analysis for competitive grid
-                    enhanced_profile = self.enhance_profile_for_grid(profile)
-                    self.brand_profiles.append(enhanced_profile)
-                    print(f"✅ Success: {enhanced_profile['company_name']}")
-                else:
-                    self.failed_extractions.append({
-                        'url': url,
-                        'reason': profile['error']
-                    })
-                    print(f"❌ Failed: {profile['error']}")
-                    
-            except Exception as e:
-                self.failed_extractions.append({
-                    'url': url,
-                    'reason': str(e)
-                })
-                print(f"❌ Error: {e}")
+            self.brand_profiles.extend(profile for profile, _ in results if profile)
+            self.failed_extractions.extend(failure for _, failure in results if failure)
         
         print(f"\n{'='*60}")
         print(f"ANALYSIS COMPLETE")
@@ -105,6 +107,32 @@ class CompetitiveGridGeneratorV2:
             'failed': self.failed_extractions
         }
     
+    def _analyze_single_brand(self, url, index, total):
+        """Analyze one brand; returns (profile, None) on success or (None, failure)"""
+        print(f"\n[{index}/{total}] Analyzing: {url}")
+        
+        try:
+            profile = self.profiler.analyze_brand(url)
+            
+            if profile['status'] == 'success':
+                # Additional AI analysis for competitive grid
+                enhanced_profile = self.enhance_profile_for_grid(profile)
+                print(f"✅ Success: {enhanced_profile['company_name']}")
+                return enhanced_profile, None
+            
+            print(f"❌ Failed: {profile['error']}")
+            return None, {
+                'url': url,
+                'reason': profile['error']
+            }
+            
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            return None, {
+                'url': url,
+                'reason': str(e)
+            }
+    
     def enhance_profile_for_grid(self, profile):
         """Enhance profile with grid-specific analysis"""
         brand_data = profile['brand_data']
@@ -837,7 +865,8 @@ class CompetitiveGridGeneratorV2:
         
         return html
     
-    def generate_report(self, urls, report_title="Competitive Landscape Analysis", output_filename=None):
+    def generate_report(self, urls, report_title="Competitive Landscape Analysis", output_filename=None,
+                        progress_callback=None):
         """Main method to generate competitive grid report"""
         
         if not output_filename:
@@ -846,7 +875,7 @@ class CompetitiveGridGeneratorV2:
         
         try:
             # Analyze brands
-            results = self.analyze_brands(urls)
+            results = self.analyze_brands(urls, progress_callback=progress_callback)
             
             # Generate HTML
             if results['successful']:
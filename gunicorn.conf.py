@@ -8,9 +8,12 @@ backlog = 2048
 
 # Worker processes - Optimized for Railway
 workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
-worker_class = "sync" 
+# Threaded workers keep status polls and downloads responsive while other
+# requests in the same worker wait on scraping and OpenAI I/O
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
 worker_connections = 1000
-timeout = 120  # Increased for longer analysis requests
+timeout = 300  # Matches start.sh; single-request analyses can run for minutes
 keepalive = 2
 max_requests = 1000
 max_requests_jitter = 100
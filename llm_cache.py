@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache
+Exact-match, in-process cache for deterministic OpenAI chat completions
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+# Entries kept before the least recently used one is evicted
+LLM_CACHE_MAX_ENTRIES = 512
+
+# Cached responses expire after a day so prompt or model changes upstream surface
+LLM_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+def _cache_key(kwargs):
+    """SHA-256 of the request parameters (model, messages, temperature, max_tokens, ...)"""
+    payload = json.dumps(kwargs, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def cached_chat_completion(client, **kwargs):
+    """Call client.chat.completions.create, reusing identical temperature-0 responses"""
+    # Sampled completions are meant to vary, so only deterministic calls are cached
+    if kwargs.get('temperature') != 0:
+        return client.chat.completions.create(**kwargs)
+
+    key = _cache_key(kwargs)
+    now = time.time()
+
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] > now:
+            _cache.move_to_end(key)
+            _stats['hits'] += 1
+            return entry[1]
+        _stats['misses'] += 1
+
+    response = client.chat.completions.create(**kwargs)
+
+    with _lock:
+        _cache[key] = (now + LLM_CACHE_TTL_SECONDS, response)
+        _cache.move_to_end(key)
+        while len(_cache) > LLM_CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+    return response
+
+
+def cache_stats():
+    """Hit/miss counters and current size, for health endpoints"""
+    with _lock:
+        return {
+            'hits': _stats['hits'],
+            'misses': _stats['misses'],
+            'entries': len(_cache)
+        }
+
+
+def clear_cache():
+    """Drop all cached responses and reset the counters"""
+    with _lock:
+        _cache.clear()
+        _stats['hits'] = 0
+        _stats['misses'] = 0
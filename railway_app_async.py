@@ -5,20 +5,25 @@ Handles long-running analysis tasks without timeouts
 """
 
 import os
+import re
 import sys
 import json
 import time
 import uuid
+import traceback
 from flask import Flask, request, jsonify, render_template_string, send_file
 from flask_cors import CORS
 from dotenv import load_dotenv
 from datetime import datetime
 import threading
+import tempfile
 from collections import defaultdict
 
 # Ensure the current directory is in the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from app_config import REPORT_MAX_AGE, configure_compression
+
 # Import our V2 competitive intelligence system
 IMPORT_ERROR = None
 SYSTEM_AVAILABLE = False
@@ -33,7 +38,6 @@ except ImportError as e:
     SYSTEM_AVAILABLE = False
 except Exception as e:
     print(f"❌ Error loading V2 system - {type(e).__name__}: {e}")
-    import traceback
     IMPORT_ERROR = f"{type(e).__name__}: {str(e)}\n{traceback.format_exc()}"
     SYSTEM_AVAILABLE = False
 
@@ -49,18 +53,83 @@ else:
 
 app = Flask(__name__)
 CORS(app)
+# Absolute http(s) URL with a host and no whitespace; used with fullmatch so
+# a trailing newline is rejected too
+URL_PATTERN = re.compile(r'https?://[^\s/$.?#][^\s]*', re.IGNORECASE)
+
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = REPORT_MAX_AGE
+configure_compression(app)
 
-# Job storage (in-memory for simplicity, could use Redis in production)
+# Job storage: in-memory for the worker running the job, mirrored to disk so any
+# gunicorn worker process can answer status and download requests
 jobs = defaultdict(dict)
 job_lock = threading.Lock()
+# Reports and job state live under the temp directory, resolved and created once at import
+REPORT_DIR = tempfile.gettempdir()
+JOB_STATE_DIR = os.path.join(REPORT_DIR, 'brandintell_jobs')
+os.makedirs(JOB_STATE_DIR, exist_ok=True)
+# Persisted job state is kept for a day after its last update, long enough
+# for any worker to answer status and download requests for finished jobs
+JOB_STATE_TTL_SECONDS = 24 * 60 * 60
+
+def _job_state_path(job_id):
+    return os.path.join(JOB_STATE_DIR, f"{job_id}.json")
+
+def expire_job_states():
+    """Delete persisted job state files not updated within the TTL"""
+    cutoff = time.time() - JOB_STATE_TTL_SECONDS
+    try:
+        entries = list(os.scandir(JOB_STATE_DIR))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+def update_job(job_id, **fields):
+    """Update a job and persist its state for other worker processes"""
+    with job_lock:
+        jobs[job_id].update(fields)
+        # Write-then-rename so readers never see a partial file
+        tmp_path = _job_state_path(job_id) + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(jobs[job_id], f)
+            os.replace(tmp_path, _job_state_path(job_id))
+        except (OSError, TypeError) as e:
+            print(f"⚠️  Could not persist state for job {job_id}: {e}")
+
+def get_job(job_id):
+    """Look up a job, falling back to state persisted by another worker"""
+    with job_lock:
+        job = jobs.get(job_id)
+        if job:
+            return dict(job)
+    
+    # Job IDs come from the URL; only well-formed UUIDs map to state files
+    try:
+        uuid.UUID(job_id)
+    except ValueError:
+        return None
+    
+    try:
+        with open(_job_state_path(job_id), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
 
 def run_analysis_job(job_id, urls):
     """Run V2 analysis in background thread"""
-    with job_lock:
-        jobs[job_id]['status'] = 'running'
-        jobs[job_id]['started_at'] = datetime.now().isoformat()
-        jobs[job_id]['progress'] = 0
-        jobs[job_id]['message'] = 'Initializing V2 analysis...'
+    update_job(
+        job_id,
+        status='running',
+        started_at=datetime.now().isoformat(),
+        progress=0,
+        message='Initializing V2 analysis...'
+    )
     
     try:
         # Import inside the thread to avoid import issues
@@ -73,50 +142,62 @@ def run_analysis_job(job_id, urls):
             print(f"Job {job_id}: Failed to import V2 system: {e}")
             raise Exception(f"Failed to import V2 analysis system: {e}")
         
-        # Use temp directory
-        import tempfile
-        temp_dir = tempfile.gettempdir()
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        output_filename = os.path.join(temp_dir, f"brandintell_v2_{job_id}_{timestamp}.html")
+        output_filename = os.path.join(REPORT_DIR, f"brandintell_v2_{job_id}_{timestamp}.html")
         
         print(f"Job {job_id}: Starting V2 analysis")
         print(f"Job {job_id}: Output will be saved to: {output_filename}")
         print(f"Job {job_id}: Processing {len(urls)} URLs: {urls}")
         
         # Update progress
-        with job_lock:
-            jobs[job_id]['message'] = f'V2 analysis phase: {len(urls)} companies...'
-            jobs[job_id]['urls'] = urls
+        update_job(job_id, message=f'V2 analysis phase: {len(urls)} companies...', urls=urls)
+        
+        # Brands finish concurrently; brand analysis covers the first 90% of the job
+        progress_per_brand = 90 / len(urls)
+        
+        def report_brand_progress(completed, total, url):
+            update_job(
+                job_id,
+                progress=int(completed * progress_per_brand),
+                message=f'Analyzed {completed}/{total} companies ({url})'
+            )
         
         # Process with V2 system
         result = generator.generate_report(
             urls=urls,
             report_title="Brandintell V2 Competitive Intelligence Analysis",
-            output_filename=output_filename
+            output_filename=output_filename,
+            progress_callback=report_brand_progress
         )
         
         print(f"Job {job_id}: Report generation returned: {result}")
         
-        with job_lock:
-            if result['success'] and os.path.exists(result['output_file']):
-                jobs[job_id]['status'] = 'completed'
-                jobs[job_id]['output_file'] = result['output_file']
-                jobs[job_id]['completed_at'] = datetime.now().isoformat()
-                jobs[job_id]['brands_analyzed'] = result.get('brands_analyzed', 0)
-                print(f"Job {job_id} completed successfully. Report saved to: {result['output_file']}")
-            else:
-                jobs[job_id]['status'] = 'failed'
-                jobs[job_id]['error'] = result.get('errors', ['Report generation failed'])
-                jobs[job_id]['failed_at'] = datetime.now().isoformat()
-                print(f"Job {job_id} failed: {result.get('errors', ['Unknown error'])}")
+        if result['success'] and os.path.exists(result['output_file']):
+            update_job(
+                job_id,
+                status='completed',
+                output_file=result['output_file'],
+                completed_at=datetime.now().isoformat(),
+                brands_analyzed=result.get('brands_analyzed', 0)
+            )
+            print(f"Job {job_id} completed successfully. Report saved to: {result['output_file']}")
+        else:
+            update_job(
+                job_id,
+                status='failed',
+                error=result.get('errors', ['Report generation failed']),
+                failed_at=datetime.now().isoformat()
+            )
+            print(f"Job {job_id} failed: {result.get('errors', ['Unknown error'])}")
             
     except Exception as e:
-        import traceback
-        with job_lock:
-            jobs[job_id]['status'] = 'failed'
-            jobs[job_id]['error'] = str(e)
-            jobs[job_id]['traceback'] = traceback.format_exc()
-            jobs[job_id]['failed_at'] = datetime.now().isoformat()
+        update_job(
+            job_id,
+            status='failed',
+            error=str(e),
+            traceback=traceback.format_exc(),
+            failed_at=datetime.now().isoformat()
+        )
         print(f"Job {job_id} failed: {e}")
 
 # HTML Template for async V2 interface
@@ -674,25 +755,38 @@ def start_v2_analysis():
         
         print(f"Received URLs: {urls}")
         
+        # Surrounding whitespace is dropped so padded copies of a URL dedupe below
+        if isinstance(urls, list):
+            urls = [url.strip() if isinstance(url, str) else url for url in urls]
+        
+        if not isinstance(urls, list) or not all(isinstance(url, str) and URL_PATTERN.fullmatch(url) for url in urls):
+            return jsonify({'error': 'Each URL must be a valid http:// or https:// address'}), 400
+        
+        # Repeated URLs would only be scraped and analyzed twice
+        urls = list(dict.fromkeys(urls))
+        
         if len(urls) < 2:
             return jsonify({'error': 'At least 2 URLs required'}), 400
         
         if len(urls) > 10:
             return jsonify({'error': 'Maximum 10 URLs allowed'}), 400
         
+        # Sweep state left behind by old jobs before adding another
+        expire_job_states()
+        
         # Create job ID
         job_id = str(uuid.uuid4())
         print(f"Created job ID: {job_id}")
         
         # Initialize job
-        with job_lock:
-            jobs[job_id] = {
-                'id': job_id,
-                'status': 'pending',
-                'urls': urls,
-                'created_at': datetime.now().isoformat(),
-                'progress': 0
-            }
+        update_job(
+            job_id,
+            id=job_id,
+            status='pending',
+            urls=urls,
+            created_at=datetime.now().isoformat(),
+            progress=0
+        )
         
         # Start background thread
         thread = threading.Thread(target=run_analysis_job, args=(job_id, urls))
@@ -708,7 +802,6 @@ def start_v2_analysis():
         })
         
     except Exception as e:
-        import traceback
         print(f"Error starting V2 analysis: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e), 'traceback': traceback.format_exc()}), 500
@@ -723,8 +816,7 @@ def start_analysis_alias():
 @app.route('/api/job-status/<job_id>')
 def job_status(job_id):
     """Get job status"""
-    with job_lock:
-        job = jobs.get(job_id)
+    job = get_job(job_id)
     
     if not job:
         return jsonify({'error': 'Job not found'}), 404
@@ -734,8 +826,7 @@ def job_status(job_id):
 @app.route('/api/download-v2-report/<job_id>')
 def download_v2_report(job_id):
     """Download completed V2 report"""
-    with job_lock:
-        job = jobs.get(job_id)
+    job = get_job(job_id)
     
     if not job:
         return jsonify({'error': 'Job not found', 'job_id': job_id}), 404
@@ -753,7 +844,9 @@ def download_v2_report(job_id):
     if output_file and os.path.exists(output_file):
         print(f"Sending file: {output_file}")
         return send_file(output_file, as_attachment=True, 
-                        download_name='brandintell_v2_report.html')
+                        download_name='brandintell_v2_report.html',
+                        mimetype='text/html', conditional=True, etag=True,
+                        max_age=REPORT_MAX_AGE)
     else:
         return jsonify({
             'error': 'Report file not found',
@@ -812,7 +905,6 @@ def test_import():
             'openai_key_present': bool(os.environ.get('OPENAI_API_KEY'))
         })
     except Exception as e:
-        import traceback
         return jsonify({
             'status': 'error',
             'error': str(e),
@@ -840,7 +932,6 @@ def debug_openai():
             'api_key_length': len(os.environ.get('OPENAI_API_KEY', ''))
         })
     except Exception as e:
-        import traceback
         return jsonify({
             'error': str(e),
             'traceback': traceback.format_exc(),
@@ -8,10 +8,86 @@ import time
 import logging
 import openai
 import json
+from collections import Counter
 from typing import Dict, List, Any
+from llm_cache import cached_chat_completion
 
 logger = logging.getLogger(__name__)
 
+# Static instructions and response schema. Kept in the system message, ahead of
+# the per-brand data, so every brand in a batch shares an identical prompt prefix
+# that the API can serve from its prompt cache.
+ANALYSIS_SYSTEM_PROMPT = """You are a professional brand strategist and competitive analyst. Provide comprehensive, actionable brand analysis in valid JSON format.
+
+Please provide a comprehensive JSON response with these exact fields:
+
+{
+  "brand_name": "Brand name exactly as given",
+  "industry": "Specific industry category",
+  "business_model": "B2B/B2C/B2B2C/Marketplace",
+  "company_size": "Startup/SME/Enterprise/Corporation",
+  "market_position": "Leader/Challenger/Follower/Niche",
+  
+  "brand_identity": {
+    "brand_personality": "Key personality traits",
+    "brand_voice": "Communication style and tone",
+    "value_proposition": "Core value proposition",
+    "target_audience": "Primary target customers",
+    "positioning_statement": "Brand positioning in market"
+  },
+  
+  "digital_presence": {
+    "website_quality": "Score 1-10 with explanation",
+    "user_experience": "Score 1-10 with explanation", 
+    "content_quality": "Score 1-10 with explanation",
+    "seo_optimization": "Score 1-10 with explanation",
+    "mobile_experience": "Score 1-10 with explanation"
+  },
+  
+  "competitive_analysis": {
+    "key_strengths": ["5 specific competitive strengths"],
+    "key_weaknesses": ["4 areas needing improvement"],
+    "opportunities": ["3 market opportunities"],
+    "threats": ["2 competitive threats"],
+    "differentiation": "How this brand differentiates from competitors"
+  },
+  
+  "strategic_recommendations": {
+    "immediate_priorities": ["3 immediate action items"],
+    "medium_term_goals": ["3 goals for next 6-12 months"], 
+    "long_term_vision": ["2 strategic long-term objectives"],
+    "investment_areas": ["Areas requiring investment/focus"]
+  },
+  
+  "content_insights": {
+    "content_themes": ["Main content themes identified"],
+    "messaging_consistency": "Assessment of message consistency",
+    "thought_leadership": "Evidence of thought leadership",
+    "customer_focus": "How customer-centric the content is"
+  },
+  
+  "technical_assessment": {
+    "website_performance": "Performance assessment",
+    "security_features": "Security implementation",
+    "modern_standards": "Adherence to modern web standards",
+    "accessibility": "Accessibility considerations"
+  },
+  
+  "overall_score": {
+    "total_score": "Overall score out of 100",
+    "score_breakdown": {
+      "brand_clarity": "Score out of 20",
+      "digital_execution": "Score out of 20", 
+      "content_quality": "Score out of 20",
+      "user_experience": "Score out of 20",
+      "competitive_position": "Score out of 20"
+    }
+  }
+}
+
+Make your analysis specific, actionable, and based on the actual content provided. Avoid generic statements.
+"""
+
 class BrandAnalyzer:
     def __init__(self):
         """Initialize the Brand Analyzer with OpenAI configuration"""
@@ -88,12 +164,13 @@ class BrandAnalyzer:
             prompt = self.create_analysis_prompt(analysis_input)
             
             # Call OpenAI API
-            response = self.client.chat.completions.create(
+            response = cached_chat_completion(
+                self.client,
                 model="gpt-4",
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are a professional brand strategist and competitive analyst. Provide comprehensive, actionable brand analysis in valid JSON format."
+                        "content": ANALYSIS_SYSTEM_PROMPT
                     },
                     {
                         "role": "user",
@@ -101,7 +178,7 @@ class BrandAnalyzer:
                     }
                 ],
                 max_tokens=2500,
-                temperature=0.7
+                temperature=0
             )
             
             # Parse response
@@ -157,74 +234,6 @@ CONTENT STATISTICS:
 - Total Words: {analysis_input['content_analysis'].get('total_words', 0)}
 - Pages Analyzed: {analysis_input['content_analysis'].get('total_pages', 0)}
 - Industry Keywords: {analysis_input['content_analysis'].get('industry_keywords', {})}
-
-Please provide a comprehensive JSON response with these exact fields:
-
-{{
-  "brand_name": "{analysis_input['brand_name']}",
-  "industry": "Specific industry category",
-  "business_model": "B2B/B2C/B2B2C/Marketplace",
-  "company_size": "Startup/SME/Enterprise/Corporation",
-  "market_position": "Leader/Challenger/Follower/Niche",
-  
-  "brand_identity": {{
-    "brand_personality": "Key personality traits",
-    "brand_voice": "Communication style and tone",
-    "value_proposition": "Core value proposition",
-    "target_audience": "Primary target customers",
-    "positioning_statement": "Brand positioning in market"
-  }},
-  
-  "digital_presence": {{
-    "website_quality": "Score 1-10 with explanation",
-    "user_experience": "Score 1-10 with explanation", 
-    "content_quality": "Score 1-10 with explanation",
-    "seo_optimization": "Score 1-10 with explanation",
-    "mobile_experience": "Score 1-10 with explanation"
-  }},
-  
-  "competitive_analysis": {{
-    "key_strengths": ["5 specific competitive strengths"],
-    "key_weaknesses": ["4 areas needing improvement"],
-    "opportunities": ["3 market opportunities"],
-    "threats": ["2 competitive threats"],
-    "differentiation": "How this brand differentiates from competitors"
-  }},
-  
-  "strategic_recommendations": {{
-    "immediate_priorities": ["3 immediate action items"],
-    "medium_term_goals": ["3 goals for next 6-12 months"], 
-    "long_term_vision": ["2 strategic long-term objectives"],
-    "investment_areas": ["Areas requiring investment/focus"]
-  }},
-  
-  "content_insights": {{
-    "content_themes": ["Main content themes identified"],
-    "messaging_consistency": "Assessment of message consistency",
-    "thought_leadership": "Evidence of thought leadership",
-    "customer_focus": "How customer-centric the content is"
-  }},
-  
-  "technical_assessment": {{
-    "website_performance": "Performance assessment",
-    "security_features": "Security implementation",
-    "modern_standards": "Adherence to modern web standards",
-    "accessibility": "Accessibility considerations"
-  }},
-  
-  "overall_score": {{
-    "total_score": "Overall score out of 100",
-    "score_breakdown": {{
-      "brand_clarity": "Score out of 20",
-      "digital_execution": "Score out of 20", 
-      "content_quality": "Score out of 20",
-      "user_experience": "Score out of 20",
-      "competitive_position": "Score out of 20"
-    }}
-  }}
-}}
-
-Make your analysis specific, actionable, and based on the actual content provided. Avoid generic statements.
 """
         
         return prompt
@@ -297,8 +306,6 @@ Make your analysis specific, actionable, and based on the actual content provide
     
     def find_common_themes(self, items: List[str]) -> List[str]:
         """Find common themes in a list of items"""
-        from collections import Counter
-        
         # Count word frequency across all items
         all_words = []
         for item in items:
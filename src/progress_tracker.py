@@ -7,60 +7,86 @@ import time
 import threading
 from typing import Dict, Optional
 
+class JobState:
+    """Per-job progress record; slotted to keep many concurrent jobs small"""
+    
+    __slots__ = (
+        'status', 'progress', 'message', 'total_brands', 'current_brand',
+        'started_at', 'estimated_completion', 'result_path', 'error',
+        'last_updated', 'completed_at', 'failed_at'
+    )
+    
+    # Timestamps that only appear in progress reports once they have been set
+    OPTIONAL_FIELDS = ('last_updated', 'completed_at', 'failed_at')
+    
+    def __init__(self, total_brands: int):
+        self.status = 'started'
+        self.progress = 0
+        self.message = 'Initializing analysis...'
+        self.total_brands = total_brands
+        self.current_brand = 0
+        self.started_at = time.time()
+        self.estimated_completion = None
+        self.result_path = None
+        self.error = None
+        self.last_updated = None
+        self.completed_at = None
+        self.failed_at = None
+    
+    def to_dict(self) -> Dict:
+        """Snapshot the job as a plain dict"""
+        return {
+            name: getattr(self, name) for name in self.__slots__
+            if name not in self.OPTIONAL_FIELDS or getattr(self, name) is not None
+        }
+
 class ProgressTracker:
     def __init__(self):
         """Initialize the progress tracker"""
-        self.jobs = {}
+        self.jobs: Dict[str, JobState] = {}
         self.lock = threading.Lock()
     
     def init_job(self, job_id: str, total_brands: int):
         """Initialize a new analysis job"""
         with self.lock:
-            self.jobs[job_id] = {
-                'status': 'started',
-                'progress': 0,
-                'message': 'Initializing analysis...',
-                'total_brands': total_brands,
-                'current_brand': 0,
-                'started_at': time.time(),
-                'estimated_completion': None,
-                'result_path': None,
-                'error': None
-            }
+            self.jobs[job_id] = JobState(total_brands)
     
     def update_progress(self, job_id: str, progress: float, message: str):
         """Update job progress"""
         with self.lock:
-            if job_id in self.jobs:
-                self.jobs[job_id]['progress'] = min(100, max(0, progress))
-                self.jobs[job_id]['message'] = message
-                self.jobs[job_id]['last_updated'] = time.time()
+            job = self.jobs.get(job_id)
+            if job:
+                job.progress = min(100, max(0, progress))
+                job.message = message
+                job.last_updated = time.time()
                 
                 # Estimate completion time
-                elapsed = time.time() - self.jobs[job_id]['started_at']
+                elapsed = job.last_updated - job.started_at
                 if progress > 0:
                     total_estimated = (elapsed / progress) * 100
                     remaining = total_estimated - elapsed
-                    self.jobs[job_id]['estimated_completion'] = remaining
+                    job.estimated_completion = remaining
     
     def complete_job(self, job_id: str, result_path: str):
         """Mark job as completed"""
         with self.lock:
-            if job_id in self.jobs:
-                self.jobs[job_id]['status'] = 'completed'
-                self.jobs[job_id]['progress'] = 100
-                self.jobs[job_id]['message'] = 'Analysis completed successfully'
-                self.jobs[job_id]['result_path'] = result_path
-                self.jobs[job_id]['completed_at'] = time.time()
+            job = self.jobs.get(job_id)
+            if job:
+                job.status = 'completed'
+                job.progress = 100
+                job.message = 'Analysis completed successfully'
+                job.result_path = result_path
+                job.completed_at = time.time()
     
     def fail_job(self, job_id: str, error_message: str):
         """Mark job as failed"""
         with self.lock:
-            if job_id in self.jobs:
-                self.jobs[job_id]['status'] = 'failed'
-                self.jobs[job_id]['message'] = f'Analysis failed: {error_message}'
-                self.jobs[job_id]['error'] = error_message
-                self.jobs[job_id]['failed_at'] = time.time()
+            job = self.jobs.get(job_id)
+            if job:
+                job.status = 'failed'
+                job.message = f'Analysis failed: {error_message}'
+                job.error = error_message
+                job.failed_at = time.time()
     
     def get_progress(self, job_id: str) -> Optional[Dict]:
         """Get current progress of a job"""
@@ -68,7 +94,7 @@ class ProgressTracker:
             if job_id not in self.jobs:
                 return None
             
-            job = self.jobs[job_id].copy()
+            job = self.jobs[job_id].to_dict()
             
             # Add human-readable time estimates
             if job.get('estimated_completion'):
@@ -90,8 +116,9 @@ class ProgressTracker:
             
             jobs_to_remove = []
             for job_id, job_data in self.jobs.items():
-                if job_data['status'] in ['completed', 'failed']:
-                    job_age = current_time - job_data.get('completed_at', job_data.get('failed_at', current_time))
+                if job_data.status in ['completed', 'failed']:
+                    finished_at = job_data.completed_at or job_data.failed_at or current_time
+                    job_age = current_time - finished_at
                     if job_age > max_age_seconds:
                         jobs_to_remove.append(job_id)
             
@@ -3,7 +3,9 @@ Web Scraper Module
 Handles comprehensive website scraping using Selenium and BeautifulSoup
 """
 
+import os
 import time
+import shutil
 import logging
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -14,17 +16,33 @@ from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import urljoin, urlparse
 import re
 from PIL import Image
 import io
 import base64
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Key pages share one host, so keep concurrent fetches per brand modest
+KEY_PAGE_WORKERS = 4
+KEY_PAGE_TIMEOUT = 20
+
+# Keep-alive pool shared by every page fetched through the scraper's session
+HTTP_POOL_SIZE = 32
+
 class WebScraper:
     def __init__(self):
         self.driver = None
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': USER_AGENT})
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         self.setup_driver()
     
     def setup_driver(self):
@@ -40,7 +58,7 @@ class WebScraper:
             chrome_options.add_argument('--disable-images')
             chrome_options.add_argument('--disable-javascript')
             chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+            chrome_options.add_argument(f'--user-agent={USER_AGENT}')
             
             # Railway-specific optimizations
             chrome_options.add_argument('--disable-background-timer-throttling')
@@ -50,9 +68,6 @@ class WebScraper:
             chrome_options.add_argument('--disable-ipc-flooding-protection')
             
             # Try to use system Chrome on Railway, fallback to ChromeDriverManager
-            import os
-            import shutil
-            
             chrome_path = shutil.which('chrome') or shutil.which('chromium') or shutil.which('google-chrome')
             
             if chrome_path:
@@ -98,15 +113,13 @@ class WebScraper:
             # Extract key pages to scrape
             key_pages = self.find_key_pages(url, homepage_data['links'])
             
-            # Scrape additional key pages
-            for page_url, page_type in key_pages:
-                try:
-                    logger.info(f"Scraping {page_type} page: {page_url}")
-                    page_data = self.scrape_page(page_url, page_type)
-                    brand_data['pages_scraped'].append(page_data)
-                    time.sleep(3)  # Respectful delay between requests
-                except Exception as e:
-                    logger.warning(f"Failed to scrape {page_type} page: {str(e)}")
+            # Fetch additional key pages concurrently over the shared HTTP session.
+            # JavaScript is disabled in the driver anyway, so static HTML is equivalent,
+            # and the driver stays on the homepage for the visual/technical passes below.
+            if key_pages:
+                with ThreadPoolExecutor(max_workers=min(KEY_PAGE_WORKERS, len(key_pages))) as executor:
+                    pages = executor.map(lambda page: self.fetch_page(*page), key_pages)
+                    brand_data['pages_scraped'].extend(pages)
             
             # Validate that we actually scraped meaningful content
             if not brand_data['pages_scraped'] or all(not page.get('content') or len(page.get('content', '').strip()) < 50 for page in brand_data['pages_scraped']):
@@ -146,37 +159,61 @@ class WebScraper:
             page_source = self.driver.page_source
             soup = BeautifulSoup(page_source, 'html.parser')
             
-            # Extract comprehensive page data
-            page_data = {
-                'url': url,
-                'type': page_type,
-                'title': self.driver.title,
-                'meta_description': self.extract_meta_description(soup),
-                'headings': self.extract_headings(soup),
-                'content': self.extract_main_content(soup),
-                'links': self.extract_links(soup, url),
-                'images': self.extract_images(soup, url),
-                'forms': self.extract_forms(soup),
-                'load_time': 0,  # Could implement performance monitoring
-                'word_count': 0
-            }
+            return self.parse_page(soup, url, page_type, self.driver.title)
             
-            # Calculate word count
-            page_data['word_count'] = len(page_data['content'].split())
+        except Exception as e:
+            logger.error(f"Error scraping page {url}: {str(e)}")
+            return self.failed_page(url, page_type, e)
+    
+    def fetch_page(self, url, page_type):
+        """Fetch and parse a single page over HTTP, without the browser"""
+        try:
+            logger.info(f"Fetching {page_type} page: {url}")
             
-            return page_data
+            response = self.session.get(url, timeout=KEY_PAGE_TIMEOUT)
+            response.raise_for_status()
+            
+            soup = BeautifulSoup(response.text, 'html.parser')
+            title = soup.title.get_text(strip=True) if soup.title else ''
+            
+            return self.parse_page(soup, url, page_type, title)
             
         except Exception as e:
-            logger.error(f"Error scraping page {url}: {str(e)}")
-            return {
-                'url': url,
-                'type': page_type,
-                'error': str(e),
-                'title': '',
-                'content': '',
-                'links': [],
-                'images': []
-            }
+            logger.warning(f"Failed to scrape {page_type} page {url}: {str(e)}")
+            return self.failed_page(url, page_type, e)
+    
+    def parse_page(self, soup, url, page_type, title):
+        """Extract comprehensive page data from parsed HTML"""
+        page_data = {
+            'url': url,
+            'type': page_type,
+            'title': title,
+            'meta_description': self.extract_meta_description(soup),
+            'headings': self.extract_headings(soup),
+            'content': self.extract_main_content(soup),
+            'links': self.extract_links(soup, url),
+            'images': self.extract_images(soup, url),
+            'forms': self.extract_forms(soup),
+            'load_time': 0,  # Could implement performance monitoring
+            'word_count': 0
+        }
+        
+        # Calculate word count
+        page_data['word_count'] = len(page_data['content'].split())
+        
+        return page_data
+    
+    def failed_page(self, url, page_type, error):
+        """Page entry recorded when a page could not be scraped"""
+        return {
+            'url': url,
+            'type': page_type,
+            'error': str(error),
+            'title': '',
+            'content': '',
+            'links': [],
+            'images': []
+        }
     
     def find_key_pages(self, base_url, homepage_links):
         """Identify key pages to scrape based on homepage links"""
@@ -191,12 +228,14 @@ class WebScraper:
             'careers': ['careers', 'jobs', 'work-with-us', 'join-us']
         }
         
+        base_netloc = urlparse(base_url).netloc
+        
         for link in homepage_links[:30]:  # Check first 30 links
             if not link.startswith(('http', 'https')):
                 link = urljoin(base_url, link)
             
             # Check if it's from the same domain
-            if urlparse(link).netloc != urlparse(base_url).netloc:
+            if urlparse(link).netloc != base_netloc:
                 continue
             
             link_lower = link.lower()
@@ -549,7 +588,11 @@ class WebScraper:
     
     
     def __del__(self):
-        """Clean up WebDriver"""
+        """Clean up WebDriver and HTTP session"""
+        session = getattr(self, 'session', None)
+        if session:
+            session.close()
+        
         if self.driver:
             try:
                 self.driver.quit()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test the V2 brand analysis report renders every mix of extraction results
+"""
+
+import sys
+
+from brand_analysis_report_v2 import BrandAnalysisReportV2
+
+def _results_with_failures(*errors):
+    """Two successful profiles plus one failed result per error"""
+    results = [
+        {'status': 'success', 'url': 'https://alpha.example', 'company_name': 'Alpha',
+         'positioning': 'Trusted analytics platform for enterprise teams'},
+        {'status': 'success', 'url': 'https://beta.example', 'company_name': 'Beta',
+         'value_proposition': 'Affordable automation for small business'}
+    ]
+    results.extend({'status': 'failed', 'url': f'https://failed{i}.example', 'error': error}
+                   for i, error in enumerate(errors))
+    return results
+
+def test_report_with_none_failure_reason():
+    """A failure without an error message sits next to one with a message"""
+    print("\n🔍 Testing report with a missing failure reason")
+    print("-" * 50)
+
+    report = BrandAnalysisReportV2()
+    report_data = report.generate_report(_results_with_failures(None, 'timeout'))
+
+    reasons = report_data['extraction_details']['failure_analysis']['failure_reasons']
+    assert reasons == {None: 1, 'timeout': 1}, reasons
+
+    html = report.generate_html_report(report_data)
+    assert 'None: 1 occurrences' in html
+    assert 'timeout: 1 occurrences' in html
+
+    # A second render of the same data comes from the cache
+    assert report.generate_html_report(report_data) is html
+    print("   ✅ PASSED: Report rendered and cached")
+
+def test_report_cache_keeps_none_and_string_none_apart():
+    """None and the string 'None' as failure reasons are different reports"""
+    print("\n🔍 Testing report cache keys for None and 'None'")
+    print("-" * 50)
+
+    report = BrandAnalysisReportV2()
+    none_data = report.generate_report(_results_with_failures(None))
+    string_data = report.generate_report(_results_with_failures('None'))
+    string_data['timestamp'] = none_data['timestamp']
+
+    assert report.generate_html_report(none_data) is not report.generate_html_report(string_data)
+    print("   ✅ PASSED: Separate cache entries")
+
+def main():
+    """Run all report tests"""
+    tests = (test_report_with_none_failure_reason, test_report_cache_keeps_none_and_string_none_apart)
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ FAILED: {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failed}/{len(tests)} report tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)